@@ -5,111 +5,212 @@ Monitors character levels and detects level-ups for Discord notifications
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import time
 import os
-from typing import Dict, List, Optional, Tuple
+import logging
+import hashlib
+import random
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying - rate limits and transient server errors
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# (connect, read) timeouts in seconds; a stalled handshake fails fast and is retried
+REQUEST_TIMEOUT = (5, 15)
+
+
+class TokenBucket:
+    """
+    Adaptive token bucket for a single rate limit window
+    
+    Capacity is the window's max requests and the refill rate starts at
+    max_requests / window. The rate is cut multiplicatively on 429s and
+    recovers additively on successful requests.
+    """
+    
+    INCREASE_FRACTION = 0.1   # Additive increase per success, as a fraction of the max rate
+    DECREASE_FACTOR = 0.5     # Multiplicative decrease on a 429
+    MIN_RATE_FRACTION = 0.05  # Floor for the refill rate, as a fraction of the max rate
+    
+    def __init__(self, max_requests: int, window: int):
+        self.capacity = max_requests
+        self.max_rate = max_requests / window
+        self.refill_rate = self.max_rate
+        self.tokens = float(max_requests)
+        self.updated = time.time()
+    
+    def refill(self, now: float):
+        """Add the tokens accrued since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+    
+    def time_until_token(self, now: float) -> float:
+        """Seconds until at least one token is available"""
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_rate
+    
+    def on_success(self):
+        self.refill_rate = min(self.refill_rate + self.max_rate * self.INCREASE_FRACTION, self.max_rate)
+    
+    def on_rate_limited(self):
+        # Align with the server's view that the window is exhausted
+        self.tokens = min(self.tokens, -1.0)
+        self.refill_rate = max(self.max_rate * self.MIN_RATE_FRACTION, self.refill_rate * self.DECREASE_FACTOR)
+
+
+def parse_limits(limits_str: str) -> Dict[int, int]:
+    """Parse an X-Rate-Limit-Ip string into {window_seconds: max_requests}"""
+    limits_map = {}
+    for limit_part in limits_str.split(','):
+        try:
+            # max_hits:period_seconds:restriction_seconds
+            max_req, win_sec, _ = map(int, limit_part.split(':'))
+        except ValueError:
+            continue
+        limits_map[win_sec] = max_req
+    return limits_map
+
+
+@dataclass(slots=True, eq=False)
 class RateLimitTracker:
     """Track and manage PoE API rate limits"""
     
-    def __init__(self):
-        self.limits = {}  # window_seconds: (current_requests, max_requests)
-        self.last_request_time = 0
-        self.backoff_until = 0
+    limits: Dict[int, Tuple[int, int]] = field(default_factory=dict)  # window_seconds: (current_requests, max_requests)
+    buckets: Dict[int, TokenBucket] = field(default_factory=dict)  # window_seconds: client-side token bucket
+    last_request_time: float = 0.0
+    backoff_until: float = 0.0
+    next_allowed_time: float = 0.0  # Absolute time before which no request may be sent
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)  # Guards all limiter state across threads
+    _limits_str: Optional[str] = field(default=None, repr=False)  # Last X-Rate-Limit-Ip header seen
+    _limits_map: Dict[int, int] = field(default_factory=dict, repr=False)  # Parsed form of _limits_str
     
     def parse_rate_limit_headers(self, headers: Dict[str, str]):
         """Parse rate limit headers and update internal state"""
         if 'X-Rate-Limit-Ip' in headers and 'X-Rate-Limit-Ip-State' in headers:
-            # Parse limits: "15:60:120,90:1800:600,180:7200:3600"
-            # Format: requests:window_seconds:max_requests
+            # Parse limits: "45:60:60,240:240:900"
+            # Format: max_requests:window_seconds:restriction_seconds
             limits_str = headers['X-Rate-Limit-Ip']
             state_str = headers['X-Rate-Limit-Ip-State']
             
-            # Parse current state: "1:60:0,1:1800:0,1:7200:0"
-            # Format: current_requests:window_seconds:hits_in_window
+            # The limits rarely change between responses, so only re-parse when they do
+            if limits_str != self._limits_str:
+                self._limits_map = parse_limits(limits_str)
+                self._limits_str = limits_str
+            limits_map = self._limits_map
+            
+            # Parse current state: "1:60:0,1:240:0"
+            # Format: current_requests:window_seconds:active_restriction_seconds
             state_parts = state_str.split(',')
+            now = time.time()
             
             for state_part in state_parts:
                 try:
-                    current, window, hits = map(int, state_part.split(':'))
-                    self.limits[window] = (current, self._get_max_for_window(limits_str, window))
+                    current, window, restricted = map(int, state_part.split(':'))
+                    max_req = limits_map.get(window, 0)
+                    self.limits[window] = (current, max_req)
                 except ValueError:
                     continue
+                
+                if max_req > 0:
+                    bucket = self.buckets.get(window)
+                    if bucket is None or bucket.capacity != max_req:
+                        bucket = self.buckets[window] = TokenBucket(max_req, window)
+                    # Never hold more tokens than the server says remain
+                    bucket.refill(now)
+                    bucket.tokens = min(bucket.tokens, max_req - current)
+                
+                # Restricted by the server - hold off until the penalty expires
+                if restricted > 0:
+                    logger.warning("Rate limit restriction for %ss window: %ss remaining", window, restricted)
+                    self.next_allowed_time = max(self.next_allowed_time, now + restricted)
+                
+                # Window exhausted - hold off until it has fully rolled over. The
+                # bucket alone would refill mid-window and push past the limit.
+                if max_req > 0 and current >= max_req:
+                    logger.warning("Rate limit reached for %ss window: %s/%s", window, current, max_req)
+                    self.next_allowed_time = max(self.next_allowed_time, now + window)
                     
-    def _get_max_for_window(self, limits_str: str, window: int) -> int:
-        """Extract max requests for a specific window from limits string"""
-        for limit_part in limits_str.split(','):
-            try:
-                requests, win_sec, max_req = map(int, limit_part.split(':'))
-                if win_sec == window:
-                    return max_req
-            except ValueError:
-                continue
-        return 0
-    
     def update_from_headers(self, headers: Dict[str, str]):
         """Update rate limit info from API response headers"""
         self.parse_rate_limit_headers(headers)
         
         if self.limits:
-            print(f"Rate limits: {self.limits}")
+            logger.debug("Rate limits: %s", self.limits)
             
             # Check if we're close to any limits (80% threshold)
             for window, (current, max_req) in self.limits.items():
                 if max_req > 0 and current / max_req >= 0.8:
-                    print(f"Warning: Close to rate limit for {window}s window: {current}/{max_req}")
+                    logger.warning("Close to rate limit for %ss window: %s/%s", window, current, max_req)
+    
+    def _get_delay(self, now: float) -> float:
+        """Seconds until the next request may be sent"""
+        # Backoff periods and exhausted windows are folded into next_allowed_time
+        delay = self.next_allowed_time - now
+        for bucket in self.buckets.values():
+            delay = max(delay, bucket.time_until_token(now))
+        return delay
     
     def can_make_request(self) -> bool:
         """Check if we can safely make another request"""
-        current_time = time.time()
-        
-        # Check if we're in a backoff period
-        if current_time < self.backoff_until:
-            return False
-        
-        # Check rate limits
-        for window, (current, max_req) in self.limits.items():
-            if max_req > 0 and current >= max_req:
-                print(f"Rate limit reached for {window}s window: {current}/{max_req}")
-                return False
-        
-        # Enforce minimum delay between requests (1 second)
-        if current_time - self.last_request_time < 1.0:
-            return False
-        
-        return True
+        return self._get_delay(time.time()) <= 0
     
     def wait_if_needed(self):
         """Wait if we need to respect rate limits"""
-        while not self.can_make_request():
-            time.sleep(1)
+        delay = self._get_delay(time.time())
+        if delay > 0:
+            time.sleep(delay)
     
     def record_request(self):
         """Record that we made a request"""
         self.last_request_time = time.time()
+        for bucket in self.buckets.values():
+            bucket.refill(self.last_request_time)
+            bucket.tokens -= 1
+        
+        # Until the server has told us its limits, enforce a minimum delay
+        # between requests (1 second)
+        if not self.buckets:
+            self.next_allowed_time = max(self.next_allowed_time, self.last_request_time + 1.0)
+    
+    def record_success(self):
+        """Record a request that was not rate limited, letting bucket rates recover"""
+        for bucket in self.buckets.values():
+            bucket.on_success()
     
     def handle_rate_limit_error(self, retry_after: int = None):
         """Handle a 429 rate limit error"""
         if retry_after:
             self.backoff_until = time.time() + retry_after
-            print(f"Rate limited, backing off for {retry_after} seconds")
+            logger.warning("Rate limited, backing off for %s seconds", retry_after)
         else:
             # Default backoff
             self.backoff_until = time.time() + 60
-            print("Rate limited, backing off for 60 seconds")
+            logger.warning("Rate limited, backing off for 60 seconds")
+        self.next_allowed_time = max(self.next_allowed_time, self.backoff_until)
+        
+        for bucket in self.buckets.values():
+            bucket.on_rate_limited()
 
 
+@dataclass(slots=True, frozen=True)
 class CharacterData:
     """Represents a PoE character"""
     
-    def __init__(self, name: str, realm: str, class_name: str, league: str, level: int):
-        self.name = name
-        self.realm = realm
-        self.class_name = class_name
-        self.league = league
-        self.level = level
+    name: str
+    realm: str
+    class_name: str
+    league: str
+    level: int
     
     def __repr__(self):
         return f"Character({self.name}, {self.class_name}, Level {self.level}, {self.league})"
@@ -126,11 +227,49 @@ class PoECharacterTracker:
         self.rate_limiter = RateLimitTracker()
         self.data_file = data_file
         
-        # Storage format: {character_name: {league: {level: int, last_updated: timestamp}}}
-        self.character_data: Dict[str, Dict[str, Dict[str, any]]] = {}
+        # Pooled session so polls reuse the same keep-alive TLS connection
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+        self.session.headers.update({"User-Agent": "PoE-Character-Tracker/1.0"})
+        
+        # Storage format: {(character_name, league): {level: int, class: str, last_updated: timestamp}}
+        # The data file keeps the nested {character_name: {league: {...}}} layout
+        self.character_state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        
+        # Last seen level per (character_name, league), checked before the full level-up path
+        self._level_cache: Dict[Tuple[str, str], int] = {}
+        
+        # Conditional GET state per (account_name, realm): (ETag, Last-Modified)
+        # and the roster parsed from the last 200 response, reused on 304
+        self._conditional: Dict[Tuple[str, str], Tuple[Optional[str], Optional[str]]] = {}
+        self._last_roster: Dict[Tuple[str, str], List[CharacterData]] = {}
+        
+        # Digest of the last 200 response body per (account_name, realm), for
+        # spotting unchanged rosters when the server sends no validators
+        self._body_hash: Dict[Tuple[str, str], bytes] = {}
+        
+        # Guards character_state when accounts are checked from several threads
+        self._state_lock = threading.RLock()
+        
+        # Set when character_state has changes not yet written to disk
+        self._dirty = False
+        
+        # Digest of the bytes last read from or written to data_file
+        self._last_written_hash: Optional[bytes] = None
         
         # Load existing data
         self.load_character_data()
+    
+    def close(self):
+        """Write any pending changes and close the HTTP session"""
+        self.flush()
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def fetch_account_characters(self, account_name: str, realm: str = "pc") -> Optional[List[CharacterData]]:
         """
@@ -143,56 +282,149 @@ class PoECharacterTracker:
         Returns:
             List of CharacterData objects, or None if failed
         """
-        # Wait if rate limiting is needed
-        self.rate_limiter.wait_if_needed()
-            
         url = "https://www.pathofexile.com/character-window/get-characters"
         params = {"accountName": account_name, "realm": realm}
-        headers = {"User-Agent": "PoE-Character-Tracker/1.0"}
+        key = (account_name, realm)
+        
+        # Only revalidate when we still hold the roster the validators belong to.
+        # Taken once up front, since forget_account may drop it mid-request.
+        headers = {}
+        cached_roster = self._last_roster.get(key)
+        if cached_roster is not None:
+            etag, last_modified = self._conditional.get(key, (None, None))
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
         
         try:
-            # Record that we're making a request
-            self.rate_limiter.record_request()
+            response = self._request_with_retry(url, params, headers)
+            if response is None:
+                return None
             
-            response = requests.get(url, params=params, headers=headers)
-            self.rate_limiter.update_from_headers(response.headers)
+            if response.status_code == 304:
+                # Roster unchanged since the last fetch
+                return list(cached_roster)
             
             if response.status_code == 200:
-                characters_data = response.json()
+                self._conditional[key] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+                
+                # Same body as last time - skip decoding and rebuilding the roster
+                body_hash = hashlib.blake2b(response.content, digest_size=16).digest()
+                if body_hash == self._body_hash.get(key) and cached_roster is not None:
+                    return list(cached_roster)
+                
+                characters_data = orjson.loads(response.content)
                 characters = []
                 
                 for char_data in characters_data:
+                    # Realm, class and league repeat across the roster, so intern them
                     character = CharacterData(
                         name=char_data['name'],
-                        realm=char_data['realm'],
-                        class_name=char_data['class'],
-                        league=char_data['league'],
+                        realm=sys.intern(char_data['realm']),
+                        class_name=sys.intern(char_data['class']),
+                        league=sys.intern(char_data['league']),
                         level=char_data['level']
                     )
                     characters.append(character)
                 
-                return characters
+                self._last_roster[key] = characters
+                self._body_hash[key] = body_hash
+                return list(characters)
                 
             elif response.status_code == 403:
-                print(f"Error: Account '{account_name}' profile is private")
+                logger.error("Account '%s' profile is private", account_name)
                 return None
             elif response.status_code == 404:
-                print(f"Error: Account '{account_name}' not found")
+                logger.error("Account '%s' not found", account_name)
                 return None
             elif response.status_code == 429:
-                # Handle rate limiting
-                retry_after = response.headers.get('Retry-After')
-                if retry_after:
-                    self.rate_limiter.handle_rate_limit_error(int(retry_after))
-                else:
-                    self.rate_limiter.handle_rate_limit_error()
+                # Backoff has already been scheduled by the rate limiter
+                logger.error("Still rate limited after retries for '%s'", account_name)
                 return None
             else:
-                print(f"Error: Unexpected status code {response.status_code}")
+                logger.error("Unexpected status code %s", response.status_code)
                 return None
                 
         except requests.exceptions.RequestException as e:
-            print(f"Request error: {e}")
+            logger.error("Request error: %s", e)
+            return None
+        except orjson.JSONDecodeError as e:
+            logger.error("Invalid character data for '%s': %s", account_name, e)
+            return None
+    
+    def forget_account(self, account_name: str, realm: str = "pc"):
+        """Drop the cached roster and conditional GET state kept for an account"""
+        key = (account_name, realm)
+        self._last_roster.pop(key, None)
+        self._conditional.pop(key, None)
+        self._body_hash.pop(key, None)
+    
+    def _request_with_retry(self, url: str, params: Dict[str, str], headers: Dict[str, str] = None,
+                            max_retries: int = 3, base: float = 1.0, cap: float = 30.0) -> Optional[requests.Response]:
+        """
+        GET a URL, retrying rate limits and transient failures
+        
+        Retries use exponential backoff with full jitter, honoring Retry-After
+        when the server sends one. 403/404 and other non-retryable responses
+        are returned immediately.
+        
+        Returns:
+            The last response received, or None if every attempt raised
+        """
+        response = None
+        for attempt in range(max_retries + 1):
+            # Wait if rate limiting is needed, then record that we're making a
+            # request. Held together so concurrent fetches stay spaced out.
+            with self.rate_limiter.lock:
+                self.rate_limiter.wait_if_needed()
+                self.rate_limiter.record_request()
+            
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+            except requests.exceptions.Timeout as e:
+                logger.warning("Request timed out: %s", e)
+                response = None
+            except requests.exceptions.RequestException as e:
+                logger.error("Request error: %s", e)
+                response = None
+            
+            retry_after = self._parse_retry_after(response)
+            
+            # Limiter state is only touched under its lock, since other
+            # threads reserve slots and spend tokens concurrently
+            if response is not None:
+                with self.rate_limiter.lock:
+                    self.rate_limiter.update_from_headers(response.headers)
+                    if response.status_code == 429:
+                        # Backoff is enforced by the rate limiter on the next attempt
+                        self.rate_limiter.handle_rate_limit_error(retry_after)
+                    else:
+                        self.rate_limiter.record_success()
+            
+            if response is not None and response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            
+            if response is not None and response.status_code == 429:
+                delay = 0
+            else:
+                delay = retry_after or random.uniform(0, min(cap, base * 2 ** attempt))
+            
+            if attempt < max_retries:
+                logger.warning("Retrying request (attempt %d/%d)", attempt + 2, max_retries + 1)
+                if delay > 0:
+                    time.sleep(delay)
+        
+        return response
+    
+    @staticmethod
+    def _parse_retry_after(response: Optional[requests.Response]) -> Optional[int]:
+        """Extract the Retry-After header in seconds, if present and numeric"""
+        if response is None:
+            return None
+        try:
+            return int(response.headers.get('Retry-After', 0)) or None
+        except ValueError:
             return None
     
     def get_character_by_name(self, account_name: str, character_name: str) -> Optional[CharacterData]:
@@ -208,40 +440,72 @@ class PoECharacterTracker:
         """Load character data from JSON file"""
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r') as f:
-                    self.character_data = json.load(f)
-                print(f"Loaded character data from {self.data_file}")
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading character data: {e}")
-                self.character_data = {}
+                with open(self.data_file, 'rb') as f:
+                    raw = f.read()
+                self.character_state = {
+                    (char_name, sys.intern(league)): entry
+                    for char_name, leagues in orjson.loads(raw).items()
+                    for league, entry in leagues.items()
+                }
+                self._level_cache = {key: entry['level'] for key, entry in self.character_state.items()}
+                self._last_written_hash = hashlib.blake2b(raw, digest_size=16).digest()
+                logger.info("Loaded character data from %s", self.data_file)
+            except (orjson.JSONDecodeError, IOError) as e:
+                logger.error("Error loading character data: %s", e)
+                self.character_state = {}
+                self._level_cache = {}
         else:
-            print(f"No existing data file found at {self.data_file}")
+            logger.info("No existing data file found at %s", self.data_file)
     
-    def save_character_data(self):
-        """Save character data to JSON file"""
+    def save_character_data(self) -> bool:
+        """
+        Save character data to JSON file
+        
+        The payload is written to a temporary sibling file and moved into
+        place, so a crash mid-write never leaves a truncated data file.
+        Writes are skipped when the payload matches what is already on disk.
+        
+        Returns True if the data is on disk, False if the write failed
+        """
+        character_data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (char_name, league), entry in self.character_state.items():
+            character_data.setdefault(char_name, {})[league] = entry
+        
+        payload = orjson.dumps(character_data)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == self._last_written_hash:
+            return True
+        
+        tmp_file = self.data_file + ".tmp"
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.character_data, f, indent=2)
-            print(f"Character data saved to {self.data_file}")
-        except IOError as e:
-            print(f"Error saving character data: {e}")
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+            self._last_written_hash = digest
+            logger.debug("Character data saved to %s", self.data_file)
+            return True
+        except OSError as e:
+            logger.error("Error saving character data: %s", e)
+            return False
+    
+    def flush(self):
+        """Save character data to file if it changed since the last save"""
+        with self._state_lock:
+            if self._dirty:
+                self._dirty = not self.save_character_data()
     
     def store_character_data(self, character: CharacterData):
-        """Store character data in memory cache and save to file"""
-        char_name = character.name
-        league = character.league
-        
-        if char_name not in self.character_data:
-            self.character_data[char_name] = {}
-        
-        self.character_data[char_name][league] = {
+        """Store character data in memory cache, marking it for the next flush"""
+        key = (character.name, character.league)
+        self._level_cache[key] = character.level
+        self.character_state[key] = {
             'level': character.level,
             'class': character.class_name,
             'last_updated': time.time()
         }
-        
-        # Save to file after updating
-        self.save_character_data()
+        self._dirty = True
     
     def check_level_up(self, character: CharacterData) -> bool:
         """
@@ -253,22 +517,22 @@ class PoECharacterTracker:
         current_level = character.level
         
         # If we haven't seen this character/league combo before, store it and return False
-        if (char_name not in self.character_data or 
-            league not in self.character_data[char_name]):
+        entry = self.character_state.get((char_name, league))
+        if entry is None:
             self.store_character_data(character)
-            print(f"First time tracking {char_name} in {league} - Level {current_level}")
+            logger.info("First time tracking %s in %s - Level %s", char_name, league, current_level)
             return False
         
         # Check if level increased
-        stored_level = self.character_data[char_name][league]['level']
+        stored_level = entry['level']
         if current_level > stored_level:
-            print(f"LEVEL UP! {char_name} ({league}): Level {stored_level} -> {current_level}")
+            logger.info("LEVEL UP! %s (%s): Level %s -> %s", char_name, league, stored_level, current_level)
             self.store_character_data(character)  # Update stored data
             return True
         
         # Check if character moved to different league (league start)
         elif current_level != stored_level:
-            print(f"Character {char_name} level changed in {league}: {stored_level} -> {current_level}")
+            logger.info("Character %s level changed in %s: %s -> %s", char_name, league, stored_level, current_level)
             self.store_character_data(character)  # Update stored data
             return False
         
@@ -279,27 +543,41 @@ class PoECharacterTracker:
         Check all characters for level ups, optionally filtered by leagues
         Returns list of (character, old_level, new_level) tuples for level ups
         """
-        if monitored_leagues is None:
-            monitored_leagues = []  # Track all leagues if none specified
-            
         characters = self.fetch_account_characters(account_name)
         if not characters:
             return []
         
-        level_ups = []
+        with self._state_lock:
+            level_ups = self._process_roster(characters, monitored_leagues)
+            self.flush()
+        return level_ups
+    
+    def _process_roster(self, characters: List[CharacterData], monitored_leagues: List[str] = None) -> List[Tuple[CharacterData, int, int]]:
+        """Run level-up detection over a fetched roster"""
+        # Track all leagues if none specified. Leagues are interned to match
+        # the interned league strings on CharacterData; a frozenset is taken
+        # as already prepared, so long-lived callers can build it once.
+        if not monitored_leagues:
+            leagues = None
+        elif isinstance(monitored_leagues, frozenset):
+            leagues = monitored_leagues
+        else:
+            leagues = frozenset(sys.intern(league) for league in monitored_leagues)
         
-        for character in characters:
-            # Skip if we're monitoring specific leagues and this isn't one of them
-            if monitored_leagues and character.league not in monitored_leagues:
-                continue
-                
-            # Store old level before checking
-            old_level = None
-            if (character.name in self.character_data and 
-                character.league in self.character_data[character.name]):
-                old_level = self.character_data[character.name][character.league]['level']
-            
-            # Check for level up
+        # Current roster keyed like the level cache, skipping unmonitored leagues
+        current = {
+            (character.name, character.league): character
+            for character in characters
+            if leagues is None or character.league in leagues
+        }
+        
+        # Only new characters and those whose level moved need the full check
+        level_cache = self._level_cache
+        changed = [(key, character) for key, character in current.items() if level_cache.get(key) != character.level]
+        
+        level_ups = []
+        for key, character in changed:
+            old_level = level_cache.get(key)
             if self.check_level_up(character):
                 level_ups.append((character, old_level, character.level))
         
@@ -312,13 +590,13 @@ class PoECharacterTracker:
     def print_stored_data(self):
         """Print all stored character data for debugging"""
         print("\n=== Stored Character Data ===")
-        for char_name, leagues in self.character_data.items():
-            for league, data in leagues.items():
-                print(f"{char_name} ({league}): Level {data['level']}, Class: {data['class']}")
+        for (char_name, league), data in self.character_state.items():
+            print(f"{char_name} ({league}): Level {data['level']}, Class: {data['class']}")
 
 
 def main():
     """Test the character tracker with level-up detection"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     tracker = PoECharacterTracker()
     
     # Test with known public account
@@ -361,6 +639,8 @@ def main():
         for char in characters:
             leagues.add(char.league)
         print(f"Leagues found: {sorted(leagues)}")
+    
+    tracker.close()
 
 
 if __name__ == "__main__":
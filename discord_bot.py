@@ -6,16 +6,94 @@ Provides commands to manage tracked accounts dynamically
 
 import discord
 from discord.ext import commands, tasks
-import json
+import orjson
 import os
 import asyncio
+import bisect
+import heapq
 import logging
+import operator
 import re
-from typing import List, Dict, Set
-from character_tracker import PoECharacterTracker
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Set, Tuple
+from character_tracker import REQUEST_TIMEOUT, CharacterData, PoECharacterTracker
 
 logger = logging.getLogger(__name__)
 
+# PoE account names carry a numeric discriminator: AccountName#1234
+_ACCOUNT_RE = re.compile(r'^[^\s#]+#\d{3,5}$')
+
+# Seconds a command's character lookup is reused before fetching again
+_CHAR_CACHE_TTL = 60
+
+# Seconds a command waits on a lookup: one full PoE request (connect + read)
+# plus slack for queueing. A lookup that outlasts this keeps running and
+# caches its result, so the user's retry is answered from the cache.
+_LOOKUP_TIMEOUT = sum(REQUEST_TIMEOUT) + 5
+
+# Discord limits: fields per embed, embeds per message, and total embed text per message
+_EMBED_MAX_FIELDS = 25
+_MESSAGE_MAX_EMBEDS = 10
+_MESSAGE_MAX_EMBED_CHARS = 6000
+
+# Character list lines, formatted straight from a CharacterData via .format(character)
+_ROW_SHORT = "• {0.name} (Level {0.level}, {0.league})"
+_ROW_LONG = "• {0.name} - Level {0.level} {0.class_name} ({0.league})"
+_ROW_LONG_BOLD = "• **{0.name}** - Level {0.level} {0.class_name} ({0.league})"
+
+# Quick command reference shown for a bare !track
+_TRACK_HELP_TEXT = (
+    "**PoE Character Tracker Commands:**\n"
+    "```\n"
+    "!track add AccountName#1234    - Add account to tracking\n"
+    "!track remove AccountName#1234 - Remove account from tracking\n"
+    "!track list                    - List all tracked accounts\n"
+    "!track channel                 - Set this channel for notifications\n"
+    "!track status                  - Show tracking status\n"
+    "!track test AccountName#1234   - Test if account is accessible\n"
+    "\n"
+    "!highest AccountName#1234      - Show highest level character\n"
+    "!characters AccountName#1234   - List all characters for account\n"
+    "!leagues                       - Show monitored leagues\n"
+    "!ping                          - Check bot responsiveness\n"
+    "!help                          - Show detailed help\n"
+    "```"
+)
+
+
+# !help sections as (name, value) embed fields, in display order
+_HELP_FIELDS = (
+    ("📋 Account Management",
+     "```\n"
+     "!track add AccountName#1234    - Add account to tracking\n"
+     "!track remove AccountName#1234 - Remove account\n"
+     "!track list                    - List tracked accounts\n"
+     "!track test AccountName#1234   - Test account access\n"
+     "```"),
+    ("⚙️ Setup Commands",
+     "```\n"
+     "!track channel                 - Set notification channel\n"
+     "!track status                  - Show tracking status\n"
+     "!leagues                       - Show monitored leagues\n"
+     "```"),
+    ("👤 Character Information",
+     "```\n"
+     "!highest AccountName#1234      - Show highest level character\n"
+     "!characters AccountName#1234   - List all characters\n"
+     "```"),
+    ("❓ How It Works",
+     "1️⃣ Add PoE accounts to track with `!track add`\n"
+     "2️⃣ Set notification channel with `!track channel`\n"
+     "3️⃣ I check every 5 minutes for level-ups\n"
+     "4️⃣ Get notified when characters level up!\n\n"
+     "**Note:** PoE accounts must have PUBLIC character profiles!"),
+    ("🔧 Utility",
+     "`!ping` - Check if I'm responsive\n"
+     "`!help` - Show this help message"),
+)
+
 
 class PoETrackerBot(commands.Bot):
     """Discord bot for managing PoE character tracking"""
@@ -36,19 +114,92 @@ class PoETrackerBot(commands.Bot):
         
         self.tracker = tracker
         self.monitored_leagues = monitored_leagues
+        # Set form for membership checks; None means all leagues are monitored
+        # (interned to match CharacterData.league, and passed to the tracker as-is)
+        self._monitored_leagues_set = frozenset(map(sys.intern, monitored_leagues)) if monitored_leagues else None
+        self._leagues_text = ", ".join(monitored_leagues) if monitored_leagues else "All leagues"
         self.check_interval = check_interval
         self.tracked_accounts: Set[str] = set()
+        self._sorted_accounts: List[str] = []  # tracked_accounts kept in display order
+        # Immutable copy for the tracking loop, rebuilt only when tracked_accounts changes
+        self._accounts_snapshot: Tuple[str, ...] = ()
         self.notification_channel_id = None
         
+        # Set when tracked accounts/channel changed and haven't been written yet
+        self._dirty = False
+        # Serialized form of what's on disk, so unchanged state isn't rewritten
+        self._last_saved_blob: Optional[bytes] = None
+        
+        # Worker threads for blocking tracker calls, so the event loop stays responsive
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tracker")
+        
+        # Level-up batches waiting to be announced, so slow Discord sends
+        # never hold up the tracking loop; drained by _notification_worker
+        self._notify_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._notify_task: Optional[asyncio.Task] = None
+        # Separate bounds on concurrent PoE fetches for the tracking loop and for
+        # commands, so a command never queues behind a whole tracking cycle.
+        # Together they stay under the pool size; the tracker's rate limiter
+        # paces the requests themselves.
+        self._fetch_sem = asyncio.Semaphore(4)
+        self._lookup_sem = asyncio.Semaphore(2)
+        
+        # Recent character lookups for commands: {account: (fetched_at, characters)}
+        self._char_cache: Dict[str, Tuple[float, List[CharacterData]]] = {}
+        # One in-flight lookup per account; concurrent commands wait on the same one
+        self._lookups: Dict[str, asyncio.Future] = {}
+        
         # Load tracked accounts from file
         self.load_tracked_accounts()
         
+        # !track sub-command handlers, all called as handler(ctx, account)
+        self._track_actions = {
+            'add': self.handle_add_account,
+            'remove': self.handle_remove_account,
+            'list': lambda ctx, account: self.handle_list_accounts(ctx),
+            'channel': lambda ctx, account: self.handle_set_channel(ctx),
+            'status': lambda ctx, account: self.handle_status(ctx),
+            'test': self.handle_test_account,
+        }
+        
         # Add commands
         self.add_commands()
         
+        # Run the tracking loop at the configured interval
+        self.tracking_loop.change_interval(seconds=self.check_interval)
+        
+        # !help content never changes, so build its embed once
+        self._help_embed = self._build_help_embed()
+        
         # Track help messages to prevent spam
         self.help_messages = {}  # {channel_id: [(user_message_id, bot_message_id), ...]}
     
+    def _embed(self, title: str, color: int, description: str = None) -> discord.Embed:
+        """Build an embed with the given title, color and optional description"""
+        return discord.Embed(title=title, description=description, color=color)
+    
+    def _sample_monitored(self, characters: List[CharacterData], limit: int) -> Tuple[List[CharacterData], int]:
+        """Return up to limit characters in monitored leagues, plus the total number that match"""
+        sample = []
+        count = 0
+        for character in characters:
+            if self._monitored_leagues_set is None or character.league in self._monitored_leagues_set:
+                count += 1
+                if len(sample) < limit:
+                    sample.append(character)
+        return sample, count
+    
+    def _build_help_embed(self) -> discord.Embed:
+        """Build the !help embed; its content is static so it's built once and reused"""
+        embed = self._embed("🤖 PoE Character Level Tracker - Help", 0xff6b35, "I monitor Path of Exile characters and notify when they level up!")
+        
+        for name, value in _HELP_FIELDS:
+            embed.add_field(name=name, value=value, inline=False)
+        
+        embed.set_footer(text="💡 Tip: Use !track for quick command reference")
+        
+        return embed
+    
     async def manage_help_spam(self, channel_id, user_message_id, bot_message_id):
         """Manage help message spam by keeping only the most recent pair"""
         try:
@@ -83,6 +234,54 @@ class PoETrackerBot(commands.Bot):
         except Exception as e:
             logger.error(f"Error managing help spam: {e}")
     
+    async def _get_characters(self, account: str, ttl: float = _CHAR_CACHE_TTL, timeout: float = _LOOKUP_TIMEOUT) -> Optional[List[CharacterData]]:
+        """
+        Fetch an account's characters, reusing a lookup made within the last ttl seconds
+        
+        Raises asyncio.TimeoutError if the PoE API doesn't answer within timeout seconds
+        """
+        cached = self._char_cache.get(account)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return list(cached[1])
+        
+        # Join a lookup already in flight for this account, or start one. The
+        # lookup is shielded so a command timing out doesn't abandon the result.
+        lookup = self._lookups.get(account)
+        if lookup is None:
+            lookup = self._lookups[account] = asyncio.ensure_future(self._fetch_characters(account))
+            lookup.add_done_callback(lambda future: self._lookup_done(account, future))
+        
+        characters = await asyncio.wait_for(asyncio.shield(lookup), timeout=timeout)
+        return list(characters) if characters is not None else None
+    
+    async def _fetch_characters(self, account: str) -> Optional[List[CharacterData]]:
+        """Fetch an account's characters in a worker thread and cache them"""
+        # Fetch in a worker thread so the event loop stays responsive
+        loop = asyncio.get_running_loop()
+        async with self._lookup_sem:
+            characters = await loop.run_in_executor(self._pool, self.tracker.fetch_account_characters, account)
+        if characters is not None:
+            self._cache_characters(account, characters)
+        return characters
+    
+    def _lookup_done(self, account: str, future: asyncio.Future):
+        """Forget a finished lookup, marking any error as seen if every caller timed out"""
+        if self._lookups.get(account) is future:
+            del self._lookups[account]
+        if not future.cancelled():
+            future.exception()
+    
+    def _cache_characters(self, account: str, characters: List[CharacterData]):
+        """Cache a lookup, evicting expired ones so one-off commands don't pile up"""
+        now = time.monotonic()
+        expired = [a for a, (fetched_at, _) in self._char_cache.items() if now - fetched_at >= _CHAR_CACHE_TTL]
+        for a in expired:
+            del self._char_cache[a]
+            # The tracker keeps per-account HTTP state too; only tracked accounts need it
+            if a not in self.tracked_accounts:
+                self.tracker.forget_account(a)
+        self._char_cache[account] = (now, characters)
+    
     def load_tracked_accounts(self):
         """Load tracked accounts from JSON file"""
         try:
@@ -90,31 +289,87 @@ class PoETrackerBot(commands.Bot):
             data_dir = "/app/data" if os.path.exists("/app/data") else "."
             accounts_file = os.path.join(data_dir, "tracked_accounts.json")
             if os.path.exists(accounts_file):
-                with open(accounts_file, 'r') as f:
-                    data = json.load(f)
+                with open(accounts_file, 'rb') as f:
+                    data = orjson.loads(f.read())
                     self.tracked_accounts = set(data.get('accounts', []))
+                    self._sorted_accounts = sorted(self.tracked_accounts)
+                    self._accounts_snapshot = tuple(self._sorted_accounts)
                     self.notification_channel_id = data.get('notification_channel_id')
+                self._last_saved_blob = orjson.dumps(self._accounts_payload(), option=orjson.OPT_INDENT_2)
                 logger.info(f"Loaded {len(self.tracked_accounts)} tracked accounts")
             else:
                 logger.info("No existing tracked accounts file found")
         except Exception as e:
             logger.error(f"Error loading tracked accounts: {e}")
     
-    def save_tracked_accounts(self):
-        """Save tracked accounts to JSON file"""
+    def save_tracked_accounts(self) -> bool:
+        """Save tracked accounts to JSON file immediately"""
+        if not self._write_file(self._accounts_payload()):
+            return False
+        self._dirty = False
+        return True
+    
+    def add_tracked_account(self, account: str):
+        """Start tracking an account, keeping the sorted view in step"""
+        if account in self.tracked_accounts:
+            return
+        self.tracked_accounts.add(account)
+        bisect.insort(self._sorted_accounts, account)
+        self._accounts_snapshot = tuple(self._sorted_accounts)
+        self._char_cache.pop(account, None)
+        self._mark_dirty()
+    
+    def remove_tracked_account(self, account: str):
+        """Stop tracking an account, keeping the sorted view in step"""
+        if account not in self.tracked_accounts:
+            return
+        self.tracked_accounts.remove(account)
+        del self._sorted_accounts[bisect.bisect_left(self._sorted_accounts, account)]
+        self._accounts_snapshot = tuple(self._sorted_accounts)
+        self._char_cache.pop(account, None)
+        self.tracker.forget_account(account)
+        self._mark_dirty()
+    
+    def _accounts_payload(self) -> Dict:
+        """Snapshot the persisted state, taken on the event loop before writing"""
+        return {
+            'accounts': list(self._sorted_accounts),
+            'notification_channel_id': self.notification_channel_id
+        }
+    
+    def _write_file(self, data: Dict) -> bool:
+        """Atomically write tracked accounts data, returning False on failure"""
         try:
+            blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            if blob == self._last_saved_blob:
+                return True  # Nothing changed since the last write
+            
             # Use the data directory if it exists, otherwise current directory
             data_dir = "/app/data" if os.path.exists("/app/data") else "."
             accounts_file = os.path.join(data_dir, "tracked_accounts.json")
-            data = {
-                'accounts': list(self.tracked_accounts),
-                'notification_channel_id': self.notification_channel_id
-            }
-            with open(accounts_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.info(f"Saved {len(self.tracked_accounts)} tracked accounts")
+            tmp_file = accounts_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_file, accounts_file)
+            self._last_saved_blob = blob
+            logger.info(f"Saved {len(data['accounts'])} tracked accounts")
+            return True
         except Exception as e:
             logger.error(f"Error saving tracked accounts: {e}")
+            return False
+    
+    def _mark_dirty(self):
+        """Schedule tracked accounts to be written by the next flush"""
+        self._dirty = True
+    
+    @tasks.loop(seconds=5)
+    async def _flush_loop(self):
+        """Write tracked accounts to disk if they changed, coalescing bursts of edits"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        if not await asyncio.to_thread(self._write_file, self._accounts_payload()):
+            self._dirty = True  # Retry on the next tick
     
     def add_commands(self):
         """Add all bot commands"""
@@ -132,47 +387,19 @@ class PoETrackerBot(commands.Bot):
             !track status - Show tracking status
             """
             if action is None:
-                await ctx.send("**PoE Character Tracker Commands:**\n"
-                             "```\n"
-                             "!track add AccountName#1234    - Add account to tracking\n"
-                             "!track remove AccountName#1234 - Remove account from tracking\n"
-                             "!track list                    - List all tracked accounts\n"
-                             "!track channel                 - Set this channel for notifications\n"
-                             "!track status                  - Show tracking status\n"
-                             "!track test AccountName#1234   - Test if account is accessible\n"
-                             "\n"
-                             "!highest AccountName#1234      - Show highest level character\n"
-                             "!characters AccountName#1234   - List all characters for account\n"
-                             "!leagues                       - Show monitored leagues\n"
-                             "!ping                          - Check bot responsiveness\n"
-                             "!help                          - Show detailed help\n"
-                             "```")
+                await ctx.send(_TRACK_HELP_TEXT)
                 return
             
-            if action.lower() == 'add':
-                await self.handle_add_account(ctx, account)
-            elif action.lower() == 'remove':
-                await self.handle_remove_account(ctx, account)
-            elif action.lower() == 'list':
-                await self.handle_list_accounts(ctx)
-            elif action.lower() == 'channel':
-                await self.handle_set_channel(ctx)
-            elif action.lower() == 'status':
-                await self.handle_status(ctx)
-            elif action.lower() == 'test':
-                await self.handle_test_account(ctx, account)
+            handler = self._track_actions.get(action.lower())
+            if handler:
+                await handler(ctx, account)
             else:
                 await ctx.send(f"Unknown action: {action}. Use `!track` for help.")
         
         @self.command(name='leagues')
         async def leagues_command(ctx):
             """Show monitored leagues"""
-            leagues_text = ", ".join(self.monitored_leagues) if self.monitored_leagues else "All leagues"
-            embed = discord.Embed(
-                title="📋 Monitored Leagues",
-                description=f"Currently monitoring: **{leagues_text}**",
-                color=0x00ff00
-            )
+            embed = self._embed("📋 Monitored Leagues", 0x00ff00, f"Currently monitoring: **{self._leagues_text}**")
             await ctx.send(embed=embed)
         
         @self.command(name='ping')
@@ -210,68 +437,8 @@ class PoETrackerBot(commands.Bot):
         @self.command(name='help')
         async def help_command(ctx):
             """Show comprehensive help information"""
-            embed = discord.Embed(
-                title="🤖 PoE Character Level Tracker - Help",
-                description="I monitor Path of Exile characters and notify when they level up!",
-                color=0xff6b35
-            )
-            
-            # Account Management
-            embed.add_field(
-                name="📋 Account Management", 
-                value="```\n"
-                      "!track add AccountName#1234    - Add account to tracking\n"
-                      "!track remove AccountName#1234 - Remove account\n"
-                      "!track list                    - List tracked accounts\n"
-                      "!track test AccountName#1234   - Test account access\n"
-                      "```",
-                inline=False
-            )
-            
-            # Setup Commands
-            embed.add_field(
-                name="⚙️ Setup Commands",
-                value="```\n"
-                      "!track channel                 - Set notification channel\n"
-                      "!track status                  - Show tracking status\n"
-                      "!leagues                       - Show monitored leagues\n"
-                      "```",
-                inline=False
-            )
-            
-            # Character Info
-            embed.add_field(
-                name="👤 Character Information",
-                value="```\n"
-                      "!highest AccountName#1234      - Show highest level character\n"
-                      "!characters AccountName#1234   - List all characters\n"
-                      "```",
-                inline=False
-            )
-            
-            # How it works
-            embed.add_field(
-                name="❓ How It Works",
-                value="1️⃣ Add PoE accounts to track with `!track add`\n"
-                      "2️⃣ Set notification channel with `!track channel`\n"
-                      "3️⃣ I check every 5 minutes for level-ups\n"
-                      "4️⃣ Get notified when characters level up!\n\n"
-                      "**Note:** PoE accounts must have PUBLIC character profiles!",
-                inline=False
-            )
-            
-            # Utility
-            embed.add_field(
-                name="🔧 Utility",
-                value="`!ping` - Check if I'm responsive\n"
-                      "`!help` - Show this help message",
-                inline=False
-            )
-            
-            embed.set_footer(text="💡 Tip: Use !track for quick command reference")
-            
             # Send the help response
-            bot_message = await ctx.send(embed=embed)
+            bot_message = await ctx.send(embed=self._help_embed)
             
             # Manage help message spam - keep only the most recent pair
             await self.manage_help_spam(ctx.channel.id, ctx.message.id, bot_message.id)
@@ -283,7 +450,7 @@ class PoETrackerBot(commands.Bot):
             return
         
         # Validate account format
-        if '#' not in account:
+        if not _ACCOUNT_RE.match(account):
             await ctx.send("❌ Account name must include discriminator: `AccountName#1234`")
             return
         
@@ -295,37 +462,34 @@ class PoETrackerBot(commands.Bot):
         await ctx.send(f"🔍 Testing account `{account}`...")
         
         try:
-            characters = self.tracker.fetch_account_characters(account)
+            characters = await self._get_characters(account)
             if characters is None:
                 await ctx.send(f"❌ Failed to access account `{account}`. Make sure the profile is public!")
                 return
             
             # Add to tracking
-            self.tracked_accounts.add(account)
-            self.save_tracked_accounts()
+            self.add_tracked_account(account)
             
             # Show what we found
-            filtered_chars = [c for c in characters if not self.monitored_leagues or c.league in self.monitored_leagues]
+            sample, filtered_count = self._sample_monitored(characters, 5)  # Show up to 5 characters
             
-            embed = discord.Embed(
-                title="✅ Account Added Successfully",
-                description=f"Now tracking account: **{account}**",
-                color=0x00ff00
-            )
+            embed = self._embed("✅ Account Added Successfully", 0x00ff00, f"Now tracking account: **{account}**")
             embed.add_field(
                 name="Characters Found",
-                value=f"{len(characters)} total, {len(filtered_chars)} in monitored leagues",
+                value=f"{len(characters)} total, {filtered_count} in monitored leagues",
                 inline=False
             )
             
-            if filtered_chars[:5]:  # Show up to 5 characters
-                char_list = "\n".join([f"• {c.name} (Level {c.level}, {c.league})" for c in filtered_chars[:5]])
-                if len(filtered_chars) > 5:
-                    char_list += f"\n... and {len(filtered_chars) - 5} more"
+            if sample:
+                char_list = "\n".join(map(_ROW_SHORT.format, sample))
+                if filtered_count > 5:
+                    char_list += f"\n... and {filtered_count - 5} more"
                 embed.add_field(name="Tracked Characters", value=char_list, inline=False)
             
             await ctx.send(embed=embed)
             
+        except asyncio.TimeoutError:
+            await ctx.send(f"❌ PoE API timed out while testing account `{account}`. Please try again later.")
         except Exception as e:
             logger.error(f"Error adding account {account}: {e}")
             await ctx.send(f"❌ Error testing account: {e}")
@@ -340,14 +504,9 @@ class PoETrackerBot(commands.Bot):
             await ctx.send(f"⚠️ Account `{account}` is not currently being tracked!")
             return
         
-        self.tracked_accounts.remove(account)
-        self.save_tracked_accounts()
+        self.remove_tracked_account(account)
         
-        embed = discord.Embed(
-            title="✅ Account Removed",
-            description=f"Stopped tracking account: **{account}**",
-            color=0xff6b35
-        )
+        embed = self._embed("✅ Account Removed", 0xff6b35, f"Stopped tracking account: **{account}**")
         await ctx.send(embed=embed)
     
     async def handle_list_accounts(self, ctx):
@@ -356,38 +515,26 @@ class PoETrackerBot(commands.Bot):
             await ctx.send("📝 No accounts are currently being tracked. Use `!track add AccountName#1234` to start tracking!")
             return
         
-        embed = discord.Embed(
-            title="📋 Tracked Accounts",
-            description=f"Currently tracking {len(self.tracked_accounts)} accounts:",
-            color=0x0099ff
-        )
+        embed = self._embed("📋 Tracked Accounts", 0x0099ff, f"Currently tracking {len(self.tracked_accounts)} accounts:")
         
-        account_list = "\n".join([f"• {account}" for account in sorted(self.tracked_accounts)])
+        account_list = "\n".join(f"• {account}" for account in self._sorted_accounts)
         embed.add_field(name="Accounts", value=account_list, inline=False)
         
-        leagues_text = ", ".join(self.monitored_leagues) if self.monitored_leagues else "All leagues"
-        embed.add_field(name="Monitored Leagues", value=leagues_text, inline=False)
+        embed.add_field(name="Monitored Leagues", value=self._leagues_text, inline=False)
         
         await ctx.send(embed=embed)
     
     async def handle_set_channel(self, ctx):
         """Handle setting notification channel"""
         self.notification_channel_id = ctx.channel.id
-        self.save_tracked_accounts()
+        self._mark_dirty()
         
-        embed = discord.Embed(
-            title="✅ Notification Channel Set",
-            description=f"Level-up notifications will be sent to {ctx.channel.mention}",
-            color=0x00ff00
-        )
+        embed = self._embed("✅ Notification Channel Set", 0x00ff00, f"Level-up notifications will be sent to {ctx.channel.mention}")
         await ctx.send(embed=embed)
     
     async def handle_status(self, ctx):
         """Handle showing tracking status"""
-        embed = discord.Embed(
-            title="📊 Tracker Status",
-            color=0x0099ff
-        )
+        embed = self._embed("📊 Tracker Status", 0x0099ff)
         
         embed.add_field(name="Tracked Accounts", value=str(len(self.tracked_accounts)), inline=True)
         embed.add_field(name="Check Interval", value=f"{self.check_interval} seconds", inline=True)
@@ -395,8 +542,7 @@ class PoETrackerBot(commands.Bot):
                        value=f"<#{self.notification_channel_id}>" if self.notification_channel_id else "Not set", 
                        inline=True)
         
-        leagues_text = ", ".join(self.monitored_leagues) if self.monitored_leagues else "All leagues"
-        embed.add_field(name="Monitored Leagues", value=leagues_text, inline=False)
+        embed.add_field(name="Monitored Leagues", value=self._leagues_text, inline=False)
         
         await ctx.send(embed=embed)
     
@@ -406,40 +552,47 @@ class PoETrackerBot(commands.Bot):
             await ctx.send("❌ Please provide an account name: `!track test AccountName#1234`")
             return
         
+        # Reject malformed names before spending an API call on them
+        if not _ACCOUNT_RE.match(account):
+            await ctx.send("❌ Account name must include discriminator: `AccountName#1234`")
+            return
+        
         await ctx.send(f"🔍 Testing account `{account}`...")
         
         try:
-            characters = self.tracker.fetch_account_characters(account)
+            characters = await self._get_characters(account)
             if characters is None:
                 await ctx.send(f"❌ Cannot access account `{account}`. Profile may be private or account name incorrect.")
                 return
             
-            filtered_chars = [c for c in characters if not self.monitored_leagues or c.league in self.monitored_leagues]
+            sample, filtered_count = self._sample_monitored(characters, 3)  # Show up to 3 characters
             
-            embed = discord.Embed(
-                title="✅ Account Test Successful",
-                description=f"Account `{account}` is accessible!",
-                color=0x00ff00
-            )
+            embed = self._embed("✅ Account Test Successful", 0x00ff00, f"Account `{account}` is accessible!")
             embed.add_field(name="Total Characters", value=str(len(characters)), inline=True)
-            embed.add_field(name="In Monitored Leagues", value=str(len(filtered_chars)), inline=True)
+            embed.add_field(name="In Monitored Leagues", value=str(filtered_count), inline=True)
             
-            if filtered_chars[:3]:  # Show up to 3 characters
-                char_list = "\n".join([f"• {c.name} (Level {c.level}, {c.league})" for c in filtered_chars[:3]])
+            if sample:
+                char_list = "\n".join(map(_ROW_SHORT.format, sample))
                 embed.add_field(name="Sample Characters", value=char_list, inline=False)
             
             await ctx.send(embed=embed)
             
+        except asyncio.TimeoutError:
+            await ctx.send(f"❌ PoE API timed out while testing account `{account}`. Please try again later.")
         except Exception as e:
             logger.error(f"Error testing account {account}: {e}")
             await ctx.send(f"❌ Error testing account: {e}")
     
     async def handle_highest_character(self, ctx, account: str):
         """Handle showing highest level character for an account"""
+        if not _ACCOUNT_RE.match(account):
+            await ctx.send("❌ Account name must include discriminator: `AccountName#1234`")
+            return
+        
         await ctx.send(f"🔍 Finding highest level character for `{account}`...")
         
         try:
-            characters = self.tracker.fetch_account_characters(account)
+            characters = await self._get_characters(account)
             if characters is None:
                 await ctx.send(f"❌ Cannot access account `{account}`. Profile may be private or account name incorrect.")
                 return
@@ -448,32 +601,34 @@ class PoETrackerBot(commands.Bot):
                 await ctx.send(f"❌ No characters found for account `{account}`.")
                 return
             
-            # Filter by monitored leagues if specified
-            if self.monitored_leagues:
-                filtered_characters = [c for c in characters if c.league in self.monitored_leagues]
-                if not filtered_characters:
-                    await ctx.send(f"❌ No characters found in monitored leagues for `{account}`.\n"
-                                 f"Monitored leagues: {', '.join(self.monitored_leagues)}")
-                    return
-                characters = filtered_characters
-            
-            # Find highest level character
-            highest_char = max(characters, key=lambda c: c.level)
-            
-            embed = discord.Embed(
-                title="🏆 Highest Level Character",
-                description=f"**{highest_char.name}** is the highest level character for `{account}`",
-                color=0xffd700  # Gold color
-            )
+            # Find the highest level characters in monitored leagues in a single pass
+            monitored = self._monitored_leagues_set
+            best_level = -1
+            best = []
+            for c in characters:
+                if monitored is not None and c.league not in monitored:
+                    continue
+                if c.level > best_level:
+                    best_level, best = c.level, [c]
+                elif c.level == best_level:
+                    best.append(c)
+            
+            if not best:
+                await ctx.send(f"❌ No characters found in monitored leagues for `{account}`.\n"
+                             f"Monitored leagues: {self._leagues_text}")
+                return
+            
+            highest_char = best[0]
+            
+            embed = self._embed("🏆 Highest Level Character", 0xffd700, f"**{highest_char.name}** is the highest level character for `{account}`")  # Gold color
             embed.add_field(name="Character", value=highest_char.name, inline=True)
             embed.add_field(name="Level", value=highest_char.level, inline=True)
             embed.add_field(name="Class", value=highest_char.class_name, inline=True)
             embed.add_field(name="League", value=highest_char.league, inline=True)
             
             # Show if there are other high-level characters
-            same_level_chars = [c for c in characters if c.level == highest_char.level]
-            if len(same_level_chars) > 1:
-                other_chars = [c.name for c in same_level_chars if c.name != highest_char.name]
+            if len(best) > 1:
+                other_chars = [c.name for c in best[1:]]
                 embed.add_field(
                     name="Also at Level " + str(highest_char.level), 
                     value=", ".join(other_chars[:5]), 
@@ -482,16 +637,22 @@ class PoETrackerBot(commands.Bot):
             
             await ctx.send(embed=embed)
             
+        except asyncio.TimeoutError:
+            await ctx.send(f"❌ PoE API timed out while looking up account `{account}`. Please try again later.")
         except Exception as e:
             logger.error(f"Error getting highest character for {account}: {e}")
             await ctx.send(f"❌ Error retrieving character data: {e}")
     
     async def handle_list_characters(self, ctx, account: str):
         """Handle listing all characters for an account"""
+        if not _ACCOUNT_RE.match(account):
+            await ctx.send("❌ Account name must include discriminator: `AccountName#1234`")
+            return
+        
         await ctx.send(f"🔍 Retrieving characters for `{account}`...")
         
         try:
-            characters = self.tracker.fetch_account_characters(account)
+            characters = await self._get_characters(account)
             if characters is None:
                 await ctx.send(f"❌ Cannot access account `{account}`. Profile may be private or account name incorrect.")
                 return
@@ -500,33 +661,29 @@ class PoETrackerBot(commands.Bot):
                 await ctx.send(f"❌ No characters found for account `{account}`.")
                 return
             
-            # Sort characters by level (highest first)
-            characters.sort(key=lambda c: c.level, reverse=True)
-            
-            # Filter by monitored leagues if specified
+            # Split by monitored leagues in one pass if specified
             if self.monitored_leagues:
-                monitored_chars = [c for c in characters if c.league in self.monitored_leagues]
-                other_chars = [c for c in characters if c.league not in self.monitored_leagues]
+                monitored_chars = []
+                other_chars = []
+                for c in characters:
+                    (monitored_chars if c.league in self._monitored_leagues_set else other_chars).append(c)
             else:
                 monitored_chars = characters
                 other_chars = []
             
-            embed = discord.Embed(
-                title="📋 Character List",
-                description=f"Characters for account: **{account}**",
-                color=0x0099ff
-            )
+            # Only the top few of each group are shown, so skip sorting the rest
+            by_level = operator.attrgetter('level')
+            top_monitored = heapq.nlargest(15, monitored_chars, key=by_level)  # Limit to 15 to avoid embed limits
+            top_other = heapq.nlargest(10, other_chars, key=by_level)
+            
+            embed = self._embed("📋 Character List", 0x0099ff, f"Characters for account: **{account}**")
             
             # Show monitored league characters
             if monitored_chars:
-                char_list = []
-                for char in monitored_chars[:15]:  # Limit to 15 to avoid embed limits
-                    char_list.append(f"• **{char.name}** - Level {char.level} {char.class_name} ({char.league})")
-                
                 field_name = "Monitored Leagues" if self.monitored_leagues else "All Characters"
                 embed.add_field(
                     name=field_name, 
-                    value="\n".join(char_list), 
+                    value="\n".join(map(_ROW_LONG_BOLD.format, top_monitored)), 
                     inline=False
                 )
                 
@@ -539,13 +696,9 @@ class PoETrackerBot(commands.Bot):
             
             # Show other league characters (if any)
             if other_chars and self.monitored_leagues:
-                other_list = []
-                for char in other_chars[:10]:  # Limit to 10
-                    other_list.append(f"• {char.name} - Level {char.level} {char.class_name} ({char.league})")
-                
                 embed.add_field(
                     name="Other Leagues (Not Monitored)", 
-                    value="\n".join(other_list), 
+                    value="\n".join(map(_ROW_LONG.format, top_other)), 
                     inline=False
                 )
                 
@@ -567,6 +720,8 @@ class PoETrackerBot(commands.Bot):
             
             await ctx.send(embed=embed)
             
+        except asyncio.TimeoutError:
+            await ctx.send(f"❌ PoE API timed out while looking up account `{account}`. Please try again later.")
         except Exception as e:
             logger.error(f"Error listing characters for {account}: {e}")
             await ctx.send(f"❌ Error retrieving character data: {e}")
@@ -574,11 +729,11 @@ class PoETrackerBot(commands.Bot):
     
     async def on_message(self, message):
         """Handle incoming messages"""
-        # Ignore messages from bots
-        if message.author.bot:
+        # Ignore messages from bots, and anything that can't be a command,
+        # before paying for context and prefix parsing
+        if message.author.bot or not message.content.startswith(self.command_prefix):
             return
         
-        # Process all messages normally
         await self.process_commands(message)
     
     async def on_ready(self):
@@ -589,6 +744,39 @@ class PoETrackerBot(commands.Bot):
         # Start the tracking loop
         if not self.tracking_loop.is_running():
             self.tracking_loop.start()
+        
+        if not self._flush_loop.is_running():
+            self._flush_loop.start()
+        
+        if self._notify_task is None or self._notify_task.done():
+            self._notify_task = asyncio.create_task(self._notification_worker())
+    
+    async def close(self):
+        """Write any pending account changes before shutting down"""
+        # tasks loops don't stop with the client, so stop tracking explicitly
+        if self.tracking_loop.is_running():
+            self.tracking_loop.cancel()
+        if self._flush_loop.is_running():
+            self._flush_loop.cancel()
+        if self._dirty:
+            self._dirty = not self.save_tracked_accounts()
+        
+        # Give queued notifications a moment to go out while still connected
+        if self._notify_task is not None:
+            try:
+                await asyncio.wait_for(self._notify_queue.join(), timeout=5)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self._notify_queue.qsize()} queued level-up notifications on shutdown")
+            self._notify_task.cancel()
+        
+        await super().close()
+        
+        # Let checks already running in worker threads finish (queued ones are
+        # dropped) before the tracker's session is closed underneath them
+        await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+        
+        # Release the tracker's pooled connections and write pending character data
+        await asyncio.to_thread(self.tracker.close)
     
     async def on_command_error(self, ctx, error):
         """Handle command errors"""
@@ -600,44 +788,57 @@ class PoETrackerBot(commands.Bot):
             logger.error(f"Command error: {error}")
             await ctx.send(f"❌ An error occurred: {error}")
     
-    @tasks.loop(seconds=60)  # Check every minute, but respect the actual interval
+    @tasks.loop(seconds=300)  # Interval is replaced with check_interval in __init__
     async def tracking_loop(self):
         """Main tracking loop that runs periodically"""
         try:
-            # Only run if it's time for a check
-            current_time = asyncio.get_event_loop().time()
-            if hasattr(self, '_last_check'):
-                if (current_time - self._last_check) < self.check_interval:
-                    return
-            
-            self._last_check = current_time
-            
             if not self.tracked_accounts:
                 return
             
             logger.info(f"Running tracking check for {len(self.tracked_accounts)} accounts")
             
-            total_level_ups = 0
-            for account in self.tracked_accounts.copy():  # Copy to avoid modification during iteration
-                try:
-                    level_ups = self.tracker.track_characters_for_levelups(account, self.monitored_leagues)
-                    
-                    if level_ups:
-                        total_level_ups += len(level_ups)
-                        await self.send_level_up_notifications(level_ups)
-                    
-                    # Small delay between accounts
-                    await asyncio.sleep(2)
-                    
-                except Exception as e:
-                    logger.error(f"Error checking account {account}: {e}")
+            # Check accounts concurrently in worker threads so the blocking
+            # tracker calls don't stall the event loop. The tracker's rate
+            # limiter still spaces out the actual API requests.
+            loop = asyncio.get_running_loop()
+            
+            async def check_account(account):
+                async with self._fetch_sem:
+                    return await loop.run_in_executor(
+                        self._pool, self.tracker.track_characters_for_levelups, account, self._monitored_leagues_set
+                    )
+            
+            accounts = self._accounts_snapshot  # Immutable, safe if accounts change mid-cycle
+            results = await asyncio.gather(*(check_account(account) for account in accounts), return_exceptions=True)
             
-            if total_level_ups > 0:
-                logger.info(f"Found {total_level_ups} level-ups this cycle")
+            all_level_ups = []
+            for account, result in zip(accounts, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error checking account {account}: {result}")
+                elif result:
+                    all_level_ups.extend(result)
+                    # Cached lookups for this account are now stale
+                    self._char_cache.pop(account, None)
+            
+            if all_level_ups:
+                logger.info(f"Found {len(all_level_ups)} level-ups this cycle")
+                try:
+                    self._notify_queue.put_nowait(all_level_ups)
+                except asyncio.QueueFull:
+                    logger.error(f"Notification queue full, dropping {len(all_level_ups)} level-ups")
                 
         except Exception as e:
             logger.error(f"Error in tracking loop: {e}")
     
+    async def _notification_worker(self):
+        """Send queued level-up batches one at a time, in the order they were found"""
+        while True:
+            level_ups = await self._notify_queue.get()
+            try:
+                await self.send_level_up_notifications(level_ups)
+            finally:
+                self._notify_queue.task_done()
+    
     async def send_level_up_notifications(self, level_ups):
         """Send Discord notifications for level-ups"""
         if not self.notification_channel_id:
@@ -650,18 +851,43 @@ class PoETrackerBot(commands.Bot):
                 logger.error(f"Could not find notification channel {self.notification_channel_id}")
                 return
             
-            for character, old_level, new_level in level_ups:
-                embed = discord.Embed(
-                    title="🎉 Level Up!",
-                    description=f"**{character.name}** reached Level **{new_level}** in **{character.league}**!",
-                    color=0xff6b35
-                )
+            if len(level_ups) == 1:
+                character, old_level, new_level = level_ups[0]
+                embed = self._embed("🎉 Level Up!", 0xff6b35, f"**{character.name}** reached Level **{new_level}** in **{character.league}**!")
                 embed.add_field(name="Character", value=character.name, inline=True)
                 embed.add_field(name="Class", value=character.class_name, inline=True)
                 embed.add_field(name="League", value=character.league, inline=True)
                 embed.add_field(name="Level Progress", value=f"{old_level} → {new_level}", inline=True)
                 
                 await channel.send(embed=embed)
+                return
+            
+            # Several level ups - one embed per batch with a field per character
+            embeds = []
+            for i in range(0, len(level_ups), _EMBED_MAX_FIELDS):
+                batch = level_ups[i:i + _EMBED_MAX_FIELDS]
+                embed = self._embed(f"🎉 {len(batch)} Level Ups!", 0xff6b35)
+                for character, old_level, new_level in batch:
+                    embed.add_field(
+                        name=character.name,
+                        value=f"{old_level} → {new_level} ({character.class_name}, {character.league})",
+                        inline=False
+                    )
+                embeds.append(embed)
+            
+            # Pack embeds into as few messages as Discord's per-message limits allow
+            messages = [[]]
+            size = 0
+            for embed in embeds:
+                if messages[-1] and (len(messages[-1]) == _MESSAGE_MAX_EMBEDS or size + len(embed) > _MESSAGE_MAX_EMBED_CHARS):
+                    messages.append([])
+                    size = 0
+                messages[-1].append(embed)
+                size += len(embed)
+            
+            # One channel shares one Discord rate limit, so send in order
+            for message in messages:
+                await channel.send(embeds=message)
                 
         except Exception as e:
             logger.error(f"Error sending level-up notification: {e}")
@@ -10,8 +10,13 @@ import sys
 import logging
 import asyncio
 from typing import List
-from character_tracker import PoECharacterTracker
-from discord_bot import PoETrackerBot
+
+# Use the faster libuv-based event loop when available (not on Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 # Configure logging with proper path
 log_dir = "/app/data" if os.path.exists("/app/data") else "."
@@ -35,6 +40,8 @@ class PoETrackerApp:
         self.running = True
         self.tracker = None
         self.bot = None
+        # Set from the signal handler to stop the bot; created once the event loop runs
+        self._stop_event = None
         
         # Load configuration from environment variables
         self.discord_token = os.getenv('DISCORD_BOT_TOKEN')
@@ -43,10 +50,6 @@ class PoETrackerApp:
         
         # Initial accounts (optional - can be added via Discord commands)
         self.initial_tracked_accounts = self._parse_list(os.getenv('TRACKED_ACCOUNTS', ''))
-        
-        # Setup signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
     
     def _parse_list(self, value: str) -> List[str]:
         """Parse comma-separated string into list"""
@@ -54,24 +57,28 @@ class PoETrackerApp:
             return []
         return [item.strip() for item in value.split(',') if item.strip()]
     
-    def _signal_handler(self, signum, frame):
-        """Handle shutdown signals gracefully"""
+    def _signal_handler(self, signum):
+        """Handle shutdown signals gracefully; runs on the event loop"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        self._stop_event.set()
     
     def validate_configuration(self) -> bool:
         """Validate that required configuration is present"""
         if not self.discord_token:
-            logger.error("DISCORD_BOT_TOKEN is required.")
-            logger.error("Please set your Discord bot token in the environment variables.")
+            logger.error("DISCORD_BOT_TOKEN is required.\n"
+                         "Please set your Discord bot token in the environment variables.")
             return False
         
-        logger.info(f"Configuration loaded:")
-        logger.info(f"  Discord bot token: {'✓ Configured' if self.discord_token else '✗ Missing'}")
-        logger.info(f"  Check interval: {self.check_interval} seconds")
-        logger.info(f"  Monitored leagues: {self.monitored_leagues}")
+        # One multi-line record, so the file and stream handlers each write once
+        summary = [
+            f"  Discord bot token: {'✓ Configured' if self.discord_token else '✗ Missing'}",
+            f"  Check interval: {self.check_interval} seconds",
+            f"  Monitored leagues: {self.monitored_leagues}",
+        ]
         if self.initial_tracked_accounts:
-            logger.info(f"  Initial tracked accounts: {len(self.initial_tracked_accounts)}")
+            summary.append(f"  Initial tracked accounts: {len(self.initial_tracked_accounts)}")
+        logger.info("Configuration loaded:\n%s", "\n".join(summary))
         
         return True
     
@@ -80,13 +87,28 @@ class PoETrackerApp:
         if self.initial_tracked_accounts and self.bot:
             logger.info(f"Adding {len(self.initial_tracked_accounts)} initial accounts from environment")
             for account in self.initial_tracked_accounts:
-                self.bot.tracked_accounts.add(account)
+                self.bot.add_tracked_account(account)
             self.bot.save_tracked_accounts()
     
     async def run_bot(self):
         """Run the Discord bot"""
         logger.info("Starting PoE Character Level Tracker Discord Bot")
         
+        self._stop_event = asyncio.Event()
+        
+        # Setup signal handlers for graceful shutdown. They belong to the
+        # running loop, so nothing fires once asyncio.run has returned.
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, self._signal_handler, signum)
+            except NotImplementedError:
+                pass  # Windows: Ctrl-C still raises KeyboardInterrupt
+        
+        # Imported here so a run that fails configuration checks never loads discord.py
+        from character_tracker import PoECharacterTracker
+        from discord_bot import PoETrackerBot
+        
         # Initialize tracker
         self.tracker = PoECharacterTracker()
         
@@ -100,13 +122,19 @@ class PoETrackerApp:
         # Setup initial accounts if provided
         await self.setup_initial_accounts()
         
+        # Run the bot until it stops on its own or a shutdown signal arrives
+        bot_task = asyncio.create_task(self.bot.start(self.discord_token))
+        stop_task = asyncio.create_task(self._stop_event.wait())
         try:
-            # Start the bot
-            await self.bot.start(self.discord_token)
+            done, _ = await asyncio.wait({bot_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+            if bot_task in done:
+                bot_task.result()  # Surface login/connection errors
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt, shutting down bot...")
         finally:
+            stop_task.cancel()
             await self.bot.close()
+            await asyncio.gather(bot_task, return_exceptions=True)
     
     def run(self):
         """Main application entry point"""
@@ -8,9 +8,29 @@ Based on research findings:
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import logging
 import sys
 
+logger = logging.getLogger(__name__)
+
+# Shared session so repeated calls reuse the pooled keep-alive connection to pathofexile.com.
+# Transient 429/5xx responses are retried with backoff, honoring Retry-After.
+_session = requests.Session()
+_session.headers.update({"User-Agent": "PoE-Character-Tracker/1.0"})
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand the final response back for status handling below
+    ),
+))
 
 def fetch_character_data(account_name, realm="pc"):
     """
@@ -30,34 +50,40 @@ def fetch_character_data(account_name, realm="pc"):
         "realm": realm
     }
     
-    headers = {
-        "User-Agent": "PoE-Character-Tracker/1.0"
-    }
-    
     try:
-        response = requests.get(url, params=params, headers=headers)
+        response = _session.get(url, params=params, timeout=(5, 15))
         
-        print(f"Status Code: {response.status_code}")
-        print(f"Headers: {dict(response.headers)}")
+        logger.info("Status Code: %s", response.status_code)
+        logger.info("Headers: %s", response.headers)
         
         if response.status_code == 200:
-            return response.json()
+            return orjson.loads(response.content)
         elif response.status_code == 403:
-            print("Error: Account profile is private")
+            logger.error("Account profile is private")
             return None
         elif response.status_code == 404:
-            print("Error: Account name is incorrect")
+            logger.error("Account name is incorrect")
             return None
         else:
-            print(f"Error: Unexpected status code {response.status_code}")
+            logger.error("Unexpected status code %s", response.status_code)
             return None
             
     except requests.exceptions.RequestException as e:
-        print(f"Request error: {e}")
+        logger.error("Request error: %s", e)
+        return None
+    except orjson.JSONDecodeError as e:
+        logger.error("Invalid JSON response: %s", e)
         return None
 
 
+def close_session():
+    """Close the shared session and its pooled connections"""
+    _session.close()
+
+
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
     # Test with known public account (new format with discriminator)
     test_account = "dtmhawk#4430"  # Known public profile with discriminator
     
@@ -66,9 +92,11 @@ def main():
     
     if data:
         print("Raw JSON Response:")
-        print(json.dumps(data, indent=2))
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
     else:
         print("Failed to fetch character data - may need different auth method")
+    
+    close_session()
 
 
 if __name__ == "__main__":